@@ -9,7 +9,7 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                            QSpinBox, QFormLayout, QPlainTextEdit, QRadioButton)
 from PyQt6.QtCore import Qt
 from dotenv import load_dotenv
-from src.logic.translation_manager import TranslationManager
+from src.logic.translation_manager import TranslationManager, DEFAULT_RATE_LIMIT
 from src.logic.functions import show_confirmation_dialog
 
 class TranslatePanel(QWidget):
@@ -80,6 +80,18 @@ class TranslatePanel(QWidget):
 
         form_layout.addRow(segmentation_layout)
 
+        # Rate limit
+        rate_layout = QHBoxLayout()
+        self.rate_limit_spin = QSpinBox()
+        self.rate_limit_spin.setRange(1, 10000)
+        self.rate_limit_spin.setValue(DEFAULT_RATE_LIMIT)
+
+        rate_layout.addWidget(QLabel("Solicitudes por minuto:"))
+        rate_layout.addWidget(self.rate_limit_spin)
+        rate_layout.addStretch()
+
+        form_layout.addRow(rate_layout)
+
         # Custom Terms section
         terms_group = QGroupBox("Términos Personalizados")
         terms_layout = QVBoxLayout()
@@ -162,6 +174,7 @@ class TranslatePanel(QWidget):
 
             # Conectar señal de cambio de proveedor para actualizar API key
             self.provider_combo.currentTextChanged.connect(self.update_provider_api_key)
+            self.provider_combo.currentTextChanged.connect(self.update_rate_limit)
 
             # Cargar modelos iniciales
             self.update_models()
@@ -169,6 +182,9 @@ class TranslatePanel(QWidget):
             # Establecer la API key inicial si existe
             self.update_provider_api_key()
 
+            # Establecer el límite de solicitudes del proveedor
+            self.update_rate_limit()
+
         except Exception as e:
             print(f"Error cargando modelos: {e}")
 
@@ -189,6 +205,21 @@ class TranslatePanel(QWidget):
         except Exception as e:
             print(f"Error actualizando API key: {e}")
 
+    def update_rate_limit(self):
+        """Actualiza el límite de solicitudes por minuto según el proveedor seleccionado"""
+        try:
+            provider = next(
+                (k for k, v in self.models_config.items()
+                 if v['name'] == self.provider_combo.currentText()),
+                None
+            )
+
+            if provider:
+                rate_limit = self.models_config[provider].get('rate_limit_rpm', DEFAULT_RATE_LIMIT)
+                self.rate_limit_spin.setValue(rate_limit)
+        except Exception as e:
+            print(f"Error actualizando límite de solicitudes: {e}")
+
     def update_models(self):
         """Actualiza la lista de modelos según el proveedor seleccionado"""
         try:
@@ -334,7 +365,8 @@ class TranslatePanel(QWidget):
             api_key,
             self.update_file_status,
             custom_terms,
-            segment_size
+            segment_size,
+            self.rate_limit_spin.value()
         )
 
     def stop_translation(self):
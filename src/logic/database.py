@@ -1,9 +1,15 @@
 import sqlite3
 import os
 import json
-from typing import List, Dict, Union, Optional
+import time
+import hashlib
+import threading
+from typing import List, Dict, Set, Union, Optional
 from datetime import datetime
 
+# Serializa la lectura-modificación-escritura del JSON de respaldo entre hilos
+_json_lock = threading.Lock()
+
 class TranslationDatabase:
     def __init__(self, directory: str):
         """
@@ -38,6 +44,14 @@ class TranslationDatabase:
                         last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 ''')
+                # Memoria de traducción para evitar llamadas repetidas a la API
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS tm (
+                        key_hash BLOB PRIMARY KEY,
+                        translation TEXT,
+                        accessed_at INTEGER
+                    )
+                ''')
                 conn.commit()
         except sqlite3.Error as e:
             print(f"Error inicializando la base de datos: {e}")
@@ -66,6 +80,35 @@ class TranslationDatabase:
         except sqlite3.Error:
             return self._check_json_record(filename)
 
+    def get_translated_set(self, filenames: List[str]) -> Set[str]:
+        """
+        Obtiene en una sola consulta cuáles de los archivos ya fueron traducidos.
+
+        Args:
+            filenames (List[str]): Nombres de archivo a verificar
+
+        Returns:
+            Set[str]: Subconjunto de nombres que ya tienen registro de traducción
+        """
+        try:
+            translated = set()
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                # Consultar por bloques para no exceder el límite de parámetros de SQLite
+                for start in range(0, len(filenames), 500):
+                    chunk = filenames[start:start + 500]
+                    cursor.execute(
+                        "SELECT filename FROM translations WHERE filename IN ({})".format(
+                            ",".join("?" * len(chunk))
+                        ),
+                        chunk
+                    )
+                    translated.update(row[0] for row in cursor.fetchall())
+            return translated
+        except sqlite3.Error:
+            json_records = {record['filename'] for record in self._get_json_records()}
+            return json_records.intersection(filenames)
+
     def _check_json_record(self, filename: str) -> bool:
         """Verifica el registro en el archivo JSON de respaldo"""
         json_path = os.path.join(self.directory, '.translation_records.json')
@@ -108,31 +151,32 @@ class TranslationDatabase:
         """Añade un registro al archivo JSON de respaldo"""
         json_path = os.path.join(self.directory, '.translation_records.json')
         try:
-            if os.path.exists(json_path):
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    records = json.load(f)
-            else:
-                records = {"translations": [], "custom_terms": ""}
-
-            record = {
-                "filename": filename,
-                "source_lang": source_lang,
-                "target_lang": target_lang,
-                "translated_date": str(datetime.now())
-            }
-
-            translations = records.get('translations', [])
-            for i, existing in enumerate(translations):
-                if existing['filename'] == filename:
-                    translations[i] = record
-                    break
-            else:
-                translations.append(record)
-            records['translations'] = translations
+            with _json_lock:
+                if os.path.exists(json_path):
+                    with open(json_path, 'r', encoding='utf-8') as f:
+                        records = json.load(f)
+                else:
+                    records = {"translations": [], "custom_terms": ""}
 
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(records, f, indent=2)
-            return True
+                record = {
+                    "filename": filename,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                    "translated_date": str(datetime.now())
+                }
+
+                translations = records.get('translations', [])
+                for i, existing in enumerate(translations):
+                    if existing['filename'] == filename:
+                        translations[i] = record
+                        break
+                else:
+                    translations.append(record)
+                records['translations'] = translations
+
+                with open(json_path, 'w', encoding='utf-8') as f:
+                    json.dump(records, f, indent=2)
+                return True
         except Exception as e:
             print(f"Error guardando en JSON: {e}")
             return False
@@ -234,17 +278,18 @@ class TranslationDatabase:
         """Guarda los términos en el archivo JSON de respaldo"""
         json_path = os.path.join(self.directory, '.translation_records.json')
         try:
-            if os.path.exists(json_path):
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    records = json.load(f)
-            else:
-                records = {"translations": [], "custom_terms": ""}
+            with _json_lock:
+                if os.path.exists(json_path):
+                    with open(json_path, 'r', encoding='utf-8') as f:
+                        records = json.load(f)
+                else:
+                    records = {"translations": [], "custom_terms": ""}
 
-            records['custom_terms'] = terms
+                records['custom_terms'] = terms
 
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(records, f, indent=2)
-            return True
+                with open(json_path, 'w', encoding='utf-8') as f:
+                    json.dump(records, f, indent=2)
+                return True
         except Exception as e:
             print(f"Error guardando términos en JSON: {e}")
             return False
@@ -258,3 +303,132 @@ class TranslationDatabase:
                 return records.get('custom_terms', "")
         except (FileNotFoundError, json.JSONDecodeError):
             return ""
+
+    @staticmethod
+    def make_tm_key(text: str, source_lang: str, target_lang: str,
+                    model: str, provider: str, custom_terms: str = "") -> bytes:
+        """
+        Genera la clave de la memoria de traducción para un texto.
+
+        Args:
+            text (str): Texto de origen
+            source_lang (str): Idioma de origen
+            target_lang (str): Idioma de destino
+            model (str): Identificador del modelo
+            provider (str): Identificador del proveedor
+            custom_terms (str): Términos personalizados usados en la traducción
+
+        Returns:
+            bytes: Hash que identifica la traducción
+        """
+        terms_hash = hashlib.sha256(custom_terms.encode('utf-8')).hexdigest()
+        key = "|".join([text, source_lang, target_lang, model or "", provider or "", terms_hash])
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=32).digest()
+
+    def tm_get(self, key: bytes) -> Optional[str]:
+        """
+        Busca una traducción en la memoria de traducción.
+
+        Args:
+            key (bytes): Clave generada con make_tm_key
+
+        Returns:
+            Optional[str]: Traducción guardada o None si no existe
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT translation FROM tm WHERE key_hash = ?",
+                    (key,)
+                )
+                result = cursor.fetchone()
+                if not result:
+                    return None
+                cursor.execute(
+                    "UPDATE tm SET accessed_at = ? WHERE key_hash = ?",
+                    (int(time.time()), key)
+                )
+                conn.commit()
+                return result[0]
+        except sqlite3.Error:
+            return None
+
+    def tm_put(self, key: bytes, translation: str) -> bool:
+        """
+        Guarda una traducción en la memoria de traducción.
+
+        Args:
+            key (bytes): Clave generada con make_tm_key
+            translation (str): Texto traducido
+
+        Returns:
+            bool: True si se guardó correctamente, False en caso contrario
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO tm (key_hash, translation, accessed_at)
+                    VALUES (?, ?, ?)
+                ''', (key, translation, int(time.time())))
+                conn.commit()
+                return True
+        except sqlite3.Error:
+            return False
+
+    def tm_get_many(self, keys: List[bytes]) -> Dict[bytes, str]:
+        """
+        Busca varias traducciones en la memoria de traducción con una sola conexión.
+
+        Args:
+            keys (List[bytes]): Claves generadas con make_tm_key
+
+        Returns:
+            Dict[bytes, str]: Traducciones encontradas indexadas por clave
+        """
+        try:
+            found = {}
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                # Consultar por bloques para no exceder el límite de parámetros de SQLite
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    cursor.execute(
+                        "SELECT key_hash, translation FROM tm WHERE key_hash IN ({})".format(
+                            ",".join("?" * len(chunk))
+                        ),
+                        chunk
+                    )
+                    found.update((bytes(row[0]), row[1]) for row in cursor.fetchall())
+                cursor.executemany(
+                    "UPDATE tm SET accessed_at = ? WHERE key_hash = ?",
+                    [(int(time.time()), key) for key in found]
+                )
+                conn.commit()
+            return found
+        except sqlite3.Error:
+            return {}
+
+    def tm_put_many(self, translations: Dict[bytes, str]) -> bool:
+        """
+        Guarda varias traducciones en la memoria de traducción en una sola transacción.
+
+        Args:
+            translations (Dict[bytes, str]): Traducciones indexadas por clave
+
+        Returns:
+            bool: True si se guardaron correctamente, False en caso contrario
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                now = int(time.time())
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO tm (key_hash, translation, accessed_at)
+                    VALUES (?, ?, ?)
+                ''', [(key, translation, now) for key, translation in translations.items()])
+                conn.commit()
+                return True
+        except sqlite3.Error:
+            return False
@@ -0,0 +1,75 @@
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+# Las lecturas, escrituras y fsync de CPython liberan el GIL durante la llamada
+# al sistema, así que varios hilos del pool pueden hacer E/S en paralelo.
+
+
+def read_text(path: Path) -> str:
+    """
+    Lee un archivo de texto completo en UTF-8.
+
+    Args:
+        path (Path): Ruta del archivo a leer
+
+    Returns:
+        str: Contenido del archivo
+    """
+    # Leer en binario y decodificar de una vez evita la capa de TextIOWrapper
+    return Path(path).read_bytes().decode('utf-8')
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """
+    Escribe un archivo de texto de forma atómica y durable.
+
+    El contenido se escribe en un archivo temporal del mismo directorio, se
+    sincroniza con el disco y luego reemplaza al archivo original, de modo que
+    una interrupción nunca deja el archivo a medio escribir.
+
+    Args:
+        path (Path): Ruta del archivo a escribir
+        text (str): Contenido a guardar
+    """
+    path = Path(path)
+    directory = path.absolute().parent
+    tmp = tempfile.NamedTemporaryFile(
+        dir=directory, prefix='.tmp_', suffix=path.name,
+        delete=False, mode='wb'
+    )
+    tmp_path = Path(tmp.name)
+    try:
+        with tmp:
+            tmp.write(text.encode('utf-8'))
+            tmp.flush()
+            os.fsync(tmp.fileno())
+
+        # Conservar los permisos del archivo original
+        try:
+            tmp_path.chmod(stat.S_IMODE(path.stat().st_mode))
+        except FileNotFoundError:
+            pass
+
+        tmp_path.replace(path)
+    except BaseException:
+        # Limpiar archivo temporal si existe
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        raise
+
+    # Sincronizar el directorio para que el reemplazo sea durable (POSIX).
+    # Es opcional: algunos sistemas de archivos no permiten fsync en directorios
+    # y el archivo ya fue reemplazado, así que no debe reportarse como error.
+    if hasattr(os, 'O_DIRECTORY'):
+        try:
+            dir_fd = os.open(directory, os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
@@ -21,15 +21,18 @@ class FileLoader(QObject):
             self.db = TranslationDatabase(directory)
 
             # Obtener y ordenar la lista de archivos .txt
+            filenames = [f for f in sorted(os.listdir(directory)) if f.endswith('.txt')]
+
+            # Verificar de una sola vez qué archivos están traducidos
+            translated = self.db.get_translated_set(filenames)
+
             txt_files = []
-            for f in sorted(os.listdir(directory)):
-                if f.endswith('.txt'):
-                    # Verificar si el archivo está traducido
-                    status = 'Traducido' if self.db.is_file_translated(f) else 'Sin procesar'
-                    txt_files.append({
-                        'name': f,
-                        'status': status
-                    })
+            for f in filenames:
+                status = 'Traducido' if f in translated else 'Sin procesar'
+                txt_files.append({
+                    'name': f,
+                    'status': status
+                })
 
             if not txt_files:
                 self.loading_error.emit("No se encontraron archivos .txt en el directorio")
@@ -0,0 +1,43 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    def __init__(self, rate_per_min: int, capacity: int = 1):
+        """
+        Limita la cantidad de solicitudes por minuto entre varios hilos.
+
+        Args:
+            rate_per_min (int): Número máximo de solicitudes por minuto
+            capacity (int): Solicitudes que se pueden hacer seguidas sin esperar
+        """
+        self.rate = rate_per_min / 60.0
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self, cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        Bloquea el hilo actual hasta que haya un token disponible.
+
+        Args:
+            cancel_event (threading.Event): Evento que interrumpe la espera
+
+        Returns:
+            bool: False si la espera se canceló, True en caso contrario
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reservar el token aunque aún no exista; la espera cubre el déficit
+            self._tokens -= 1
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait_time > 0:
+            if cancel_event is not None:
+                return not cancel_event.wait(wait_time)
+            time.sleep(wait_time)
+        return True
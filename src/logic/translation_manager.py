@@ -1,125 +1,105 @@
-from typing import List, Dict, Optional, Tuple, Callable
-from PyQt6.QtCore import QObject, pyqtSignal, QThread
-import os
-import time
+from typing import List, Dict, Optional, Callable
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+import functools
+import threading
+from pathlib import Path
 from .database import TranslationDatabase
 from .translator import TranslatorLogic
-
-class TranslationWorker(QObject):
-    progress_updated = pyqtSignal(str)
-    translation_completed = pyqtSignal(str, bool)
-    all_translations_completed = pyqtSignal()
-    error_occurred = pyqtSignal(str)
-
-    def __init__(self, files_to_translate: List[Dict[str, str]],
-                 working_directory: str, db: TranslationDatabase,
-                 translator: TranslatorLogic, source_lang: str,
-                 target_lang: str, api_key: str, provider: str,
-                 model: str, custom_terms: str = "",
-                 segment_size: Optional[int] = None):
+from .rate_limit import TokenBucket
+from .fs_utils import read_text, atomic_write_text
+
+# Número máximo de archivos traducidos en paralelo
+MAX_PARALLEL = 4
+# Límite de solicitudes por minuto si el proveedor no define uno
+DEFAULT_RATE_LIMIT = 12
+
+class TranslateFileRunnable(QRunnable):
+    """
+    Traduce un único archivo dentro del pool de hilos.
+
+    Cada tarea lee, traduce y escribe su propio archivo, por lo que la lectura
+    y escritura de un capítulo se solapan con las solicitudes de red del resto.
+    """
+
+    class Signals(QObject):
+        progress_updated = pyqtSignal(str)
+        translation_completed = pyqtSignal(str, bool)
+        error_occurred = pyqtSignal(str)
+        finished = pyqtSignal(bool)
+
+    def __init__(self, index: int, progress_message: str, filename: str,
+                 working_directory: Path, db: TranslationDatabase,
+                 translate: Callable[[str], Optional[str]],
+                 make_tm_key: Callable[[str], bytes],
+                 stop_event: threading.Event, source_lang: str,
+                 target_lang: str):
         super().__init__()
-        self.files_to_translate = files_to_translate
+        self.signals = self.Signals()
+        self.index = index
+        self.progress_message = progress_message
+        self.filename = filename
         self.working_directory = working_directory
         self.db = db
-        self.translator = translator
+        self.translate = translate
+        self.make_tm_key = make_tm_key
+        self.stop_event = stop_event
         self.source_lang = source_lang
         self.target_lang = target_lang
-        self.api_key = api_key
-        self.provider = provider
-        self.model = model
-        self.custom_terms = custom_terms
-        self.segment_size = segment_size
-        self._stop_requested = False
-        self.translator.segment_size = segment_size
-
-    def stop(self):
-        self._stop_requested = True
 
     def run(self):
+        success = False
         try:
-            total_files = len(self.files_to_translate)
-            successful_translations = 0
-
-            # Configurar tamaño de segmento si se especificó
-            if self.segment_size is not None:
-                        self.translator.segment_size = self.segment_size
-
-            for i, file_info in enumerate(self.files_to_translate, 1):
-                if self._stop_requested:
-                    break
-
-                filename = file_info['name']
-                self.progress_updated.emit(f"Traduciendo capítulo {i} de {total_files}: {filename}")
-
-                # Verificar si ya está traducido
-                if self.db.is_file_translated(filename):
-                    continue
-
-                # Traducir el archivo
-                success = self._translate_single_file(filename)
+            if self.stop_event.is_set():
+                return
 
-                if success:
-                    successful_translations += 1
-                    self.db.add_translation_record(filename, self.source_lang, self.target_lang)
-                    self.translation_completed.emit(filename, True)
-                else:
-                    self.translation_completed.emit(filename, False)
+            self.signals.progress_updated.emit(
+                self.progress_message.format(self.index, self.filename)
+            )
 
-                # Esperar antes de la siguiente traducción si no es el último archivo
-                if i < total_files and not self._stop_requested:
-                    time.sleep(5)
+            # Traducir el archivo
+            success = self._translate_single_file(self.filename)
 
-            if not self._stop_requested:
-                final_message = (f"Traducción completada. {successful_translations} "
-                               f"de {total_files} archivos traducidos exitosamente.")
-                self.progress_updated.emit(final_message)
-                self.all_translations_completed.emit()
+            if success:
+                self.db.add_translation_record(self.filename, self.source_lang, self.target_lang)
+            elif self.stop_event.is_set():
+                # Cancelado por el usuario: el archivo queda sin procesar
+                return
+            self.signals.translation_completed.emit(self.filename, success)
 
         except Exception as e:
-            self.error_occurred.emit(f"Error en el proceso de traducción: {str(e)}")
+            self.signals.error_occurred.emit(f"Error en el proceso de traducción: {str(e)}")
         finally:
-            self.all_translations_completed.emit()
+            self.signals.finished.emit(success)
 
     def _translate_single_file(self, filename: str) -> bool:
         try:
-            input_path = os.path.join(self.working_directory, filename)
-            temp_output_path = os.path.join(self.working_directory, f".temp_{filename}")
+            input_path = self.working_directory / filename
 
             # Leer archivo original
-            with open(input_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-
-            # Intentar traducir
-            translated_text = self.translator.translate_text(
-                text,
-                self.source_lang,
-                self.target_lang,
-                self.api_key,
-                self.provider,
-                self.model,
-                self.custom_terms
-            )
+            text = read_text(input_path)
+
+            # Buscar primero en la memoria de traducción
+            tm_key = self.make_tm_key(text)
+            translated_text = self.db.tm_get(tm_key)
 
-            if not translated_text:
-                self.error_occurred.emit(f"Error al traducir {filename}: No se obtuvo traducción")
-                return False
+            if translated_text is None:
+                # Intentar traducir
+                translated_text = self.translate(text)
 
-            # Guardar primero en archivo temporal
-            with open(temp_output_path, 'w', encoding='utf-8') as file:
-                file.write(translated_text)
+                if not translated_text:
+                    if self.stop_event.is_set():
+                        return False
+                    self.signals.error_occurred.emit(f"Error al traducir {filename}: No se obtuvo traducción")
+                    return False
 
-            # Si todo salió bien, reemplazar el archivo original
-            os.replace(temp_output_path, input_path)
+                self.db.tm_put(tm_key, translated_text)
+
+            # Reemplazar el archivo original de forma atómica
+            atomic_write_text(input_path, translated_text)
             return True
 
         except Exception as e:
-            self.error_occurred.emit(f"Error al traducir {filename}: {str(e)}")
-            # Limpiar archivo temporal si existe
-            if os.path.exists(temp_output_path):
-                try:
-                    os.remove(temp_output_path)
-                except:
-                    pass
+            self.signals.error_occurred.emit(f"Error al traducir {filename}: {str(e)}")
             return False
 
 class TranslationManager(QObject):
@@ -131,13 +111,19 @@ class TranslationManager(QObject):
 
     def __init__(self):
         super().__init__()
-        self.translator = TranslatorLogic(segment_size=None)
+        self.translator = TranslatorLogic(max_connections=MAX_PARALLEL)
         self.db: Optional[TranslationDatabase] = None
         self.working_directory: Optional[str] = None
         self.current_provider = None
         self.current_model = None
-        self.worker = None
-        self.thread = None
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(MAX_PARALLEL)
+        self._runnables: List[TranslateFileRunnable] = []
+        self._stop_event = threading.Event()
+        self._pending_files = 0
+        self._successful_translations = 0
+        self._total_files = 0
+        self._finished = True
 
     def initialize(self, directory: str, provider: str = None, model: str = None) -> None:
         """
@@ -156,7 +142,8 @@ class TranslationManager(QObject):
     def translate_files(self, files_to_translate: List[Dict[str, str]],
                        source_lang: str, target_lang: str, api_key: str,
                        status_callback: Optional[Callable[[str, str], None]] = None,
-                       custom_terms: str = "", segment_size: Optional[int] = None) -> None:
+                       custom_terms: str = "", segment_size: Optional[int] = None,
+                       rate_per_min: int = DEFAULT_RATE_LIMIT) -> None:
         """
         Inicia la traducción de archivos.
 
@@ -168,6 +155,7 @@ class TranslationManager(QObject):
             status_callback: Función para actualizar el estado en la UI
             custom_terms: Términos personalizados para la traducción
             segment_size: Tamaño de segmentación opcional (caracteres por segmento)
+            rate_per_min: Número máximo de solicitudes por minuto al proveedor
         """
         if not self.working_directory or not self.db:
             self.error_occurred.emit("No se ha inicializado el directorio de trabajo")
@@ -177,52 +165,121 @@ class TranslationManager(QObject):
         if custom_terms.strip():
             self.db.save_custom_terms(custom_terms)
 
-        # Crear y configurar el worker
-        self.thread = QThread()
-        self.worker = TranslationWorker(
-            files_to_translate,
-            self.working_directory,
-            self.db,
-            self.translator,
-            source_lang,
-            target_lang,
-            api_key,
-            self.current_provider,
-            self.current_model,
-            custom_terms,
-            segment_size
+        rate_limiter = TokenBucket(rate_per_min)
+        self._stop_event = threading.Event()
+
+        # Fijar una sola vez los parámetros comunes a todos los archivos
+        translate = functools.partial(
+            self.translator.translate_text,
+            source_lang=source_lang,
+            target_lang=target_lang,
+            api_key=api_key,
+            provider=self.current_provider,
+            model=self.current_model,
+            custom_terms=custom_terms,
+            segment_size=segment_size,
+            translation_memory=self.db,
+            rate_limiter=rate_limiter,
+            cancel_event=self._stop_event
         )
+        make_tm_key = functools.partial(
+            TranslationDatabase.make_tm_key,
+            source_lang=source_lang,
+            target_lang=target_lang,
+            model=self.current_model,
+            provider=self.current_provider,
+            custom_terms=custom_terms
+        )
+        self._total_files = len(files_to_translate)
+        self._successful_translations = 0
+        self._finished = False
+
+        # Omitir los archivos ya traducidos con una sola consulta
+        translated = self.db.get_translated_set([f['name'] for f in files_to_translate])
+        pending = [
+            (i, file_info['name'])
+            for i, file_info in enumerate(files_to_translate, 1)
+            if file_info['name'] not in translated
+        ]
+        self._pending_files = len(pending)
+
+        if not pending:
+            self._finish_translations()
+            return
 
-        # Mover el worker al thread
-        self.worker.moveToThread(self.thread)
-
-        # Conectar señales
-        self.thread.started.connect(self.worker.run)
-        self.worker.progress_updated.connect(self.progress_updated)
-        self.worker.translation_completed.connect(self.translation_completed)
-        self.worker.all_translations_completed.connect(self.all_translations_completed)
-        self.worker.error_occurred.connect(self.error_occurred)
-
-        # Conectar el callback de estado si existe
-        if status_callback:
-            self.worker.translation_completed.connect(
-                lambda filename, success: status_callback(filename, "Traducido" if success else "Error")
+        # Crear una tarea por archivo y enviarla al pool
+        working_directory = Path(self.working_directory)
+        progress_message = f"Traduciendo capítulo {{}} de {self._total_files}: {{}}"
+        for i, filename in pending:
+            runnable = TranslateFileRunnable(
+                i,
+                progress_message,
+                filename,
+                working_directory,
+                self.db,
+                translate,
+                make_tm_key,
+                self._stop_event,
+                source_lang,
+                target_lang
             )
 
-        # Limpieza cuando termine
-        self.worker.all_translations_completed.connect(self.thread.quit)
-        self.worker.all_translations_completed.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
+            # Conectar señales
+            runnable.signals.progress_updated.connect(self.progress_updated)
+            runnable.signals.translation_completed.connect(self.translation_completed)
+            runnable.signals.error_occurred.connect(self.error_occurred)
+            runnable.signals.finished.connect(self._on_file_finished)
+
+            # Conectar el callback de estado si existe
+            if status_callback:
+                runnable.signals.translation_completed.connect(
+                    lambda filename, success: status_callback(filename, "Traducido" if success else "Error")
+                )
+
+            # Conservar la tarea para poder retirarla del pool al detener
+            runnable.setAutoDelete(False)
+            self._runnables.append(runnable)
+            self.pool.start(runnable)
+
+    def _on_file_finished(self, success: bool) -> None:
+        """Lleva la cuenta de los archivos procesados y notifica al terminar"""
+        if self._finished:
+            return
+        if success:
+            self._successful_translations += 1
+        self._pending_files -= 1
+        if self._pending_files == 0:
+            self._finish_translations()
+
+    def _finish_translations(self) -> None:
+        """Emite el resumen final una vez procesados todos los archivos"""
+        # Notificar una sola vez por lote
+        if self._finished:
+            return
+        self._finished = True
+
+        # Liberar las conexiones abiertas con el proveedor
+        self.translator.close()
+        self._runnables = []
 
-        # Iniciar el thread
-        self.thread.start()
+        if not self._stop_event.is_set():
+            final_message = (f"Traducción completada. {self._successful_translations} "
+                           f"de {self._total_files} archivos traducidos exitosamente.")
+            self.progress_updated.emit(final_message)
+        self.all_translations_completed.emit()
 
     def stop_translation(self) -> None:
         """Detiene el proceso de traducción en curso"""
-        if self.worker:
-            self.worker.stop()
+        if self._pending_files:
+            # Abortar las solicitudes en curso y las esperas del limitador
+            self._stop_event.set()
             self.progress_updated.emit("Deteniendo traducción...")
 
+            # Retirar del pool las tareas que aún no han empezado
+            for runnable in list(self._runnables):
+                if self.pool.tryTake(runnable):
+                    self._on_file_finished(False)
+
     def get_supported_languages(self) -> Dict[str, str]:
         """Obtiene la lista de idiomas soportados"""
         return self.translator.get_supported_languages()
@@ -1,12 +1,56 @@
 import requests
-import time
+from requests.adapters import HTTPAdapter
 import json
-from typing import Optional, Dict, List
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, List, Iterator
 from pathlib import Path
+from .database import TranslationDatabase
+from .rate_limit import TokenBucket
+
+# Marcadores de fin de oración comunes en novelas; ante dos coincidencias en la
+# misma posición gana la que aparece primero en la lista
+_SENTENCE_ENDINGS = [
+    '. ', '? ', '! ',           # Puntuación básica
+    '] ', '] \n', ']\n',        # Diálogos con corchetes
+    '..." ', '..." \n',         # Diálogos con puntos suspensivos
+    '…" ', '…" \n',             # Puntos suspensivos (Unicode)
+    '" ', '" \n',               # Diálogos con comillas
+    '."', '?"', '!"',           # Puntuación dentro de comillas
+    '." ', '?" ', '!" '         # Puntuación dentro de comillas con espacio
+]
+_SENTENCE_END_RE = re.compile('|'.join(re.escape(ending) for ending in _SENTENCE_ENDINGS))
+_BLANK_LINE_RE = re.compile(r'\s*?\n\n')
+_NON_WHITESPACE_RE = re.compile(r'\S')
+
+# Reintentos ante errores transitorios del proveedor
+MAX_RETRIES = 5
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+# Esperas más largas indican una cuota agotada, no un límite momentáneo
+MAX_RETRY_AFTER = 300.0
+# Tiempo máximo para conectar y entre fragmentos recibidos (segundos)
+REQUEST_TIMEOUT = (10, 300)
+
+class TranslationCancelled(Exception):
+    """Se lanza cuando se detiene la traducción con una solicitud en curso"""
 
 class TranslatorLogic:
-    def __init__(self, segment_size=None):
-        """Inicializa el traductor con los idiomas soportados"""
+    def __init__(self, max_connections: int = 10):
+        """
+        Inicializa el traductor con los idiomas soportados.
+
+        La instancia se comparte entre todos los hilos de traducción: no guarda
+        estado por llamada y su sesión HTTP es segura entre hilos.
+
+        Args:
+            max_connections (int): Conexiones que se mantienen abiertas por proveedor
+        """
         self.lang_codes = {
             'Español (MX)': 'Spanish (es_MX)',
             'Español (ES)': 'Spanish (es_ES)',
@@ -22,7 +66,16 @@ class TranslatorLogic:
             self.models_config = json.load(f)
 
         self.prompt_template = self._load_prompt_template()
-        self.segment_size = segment_size  # Tamaño objetivo para cada segmento
+
+        # Sesión HTTP compartida para reutilizar conexiones entre solicitudes
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.models_config),
+                              pool_maxsize=max_connections)
+        self._session.mount('https://', adapter)
+
+    def close(self) -> None:
+        """Cierra las conexiones abiertas de la sesión HTTP"""
+        self._session.close()
 
     def _load_prompt_template(self) -> str:
         """
@@ -39,94 +92,73 @@ class TranslatorLogic:
             print(f"Error cargando el prompt base: {str(e)}")
             return ""
 
-    def _segment_text(self, text: str) -> List[str]:
+    def _segment_text(self, text: str, segment_size: Optional[int]) -> List[str]:
         """
         Segmenta el texto en partes manejables respetando oraciones y párrafos.
         Asegura que los segmentos terminen en una línea en blanco después de un marcador de fin.
 
         Args:
             text (str): Texto completo a segmentar
+            segment_size (Optional[int]): Tamaño objetivo de cada segmento;
+                None para no segmentar
 
         Returns:
             List[str]: Lista de segmentos de texto
         """
-        if self.segment_size is None:  # ¡Importante!
+        if segment_size is None:  # ¡Importante!
             return [text]
         segments = []
-        current_segment = []
-        current_length = 0
 
-        # Normalizar saltos de línea y dividir en párrafos
+        # Normalizar saltos de línea
         text = text.replace('\r\n', '\n')
-        paragraphs = text.split('\n\n')
-
-        # Definir marcadores de fin de oración comunes en novelas
-        sentence_endings = [
-            '. ', '? ', '! ',           # Puntuación básica
-            '] ', '] \n', ']\n',        # Diálogos con corchetes
-            '..." ', '..." \n',         # Diálogos con puntos suspensivos
-            '…" ', '…" \n',             # Puntos suspensivos (Unicode)
-            '" ', '" \n',               # Diálogos con comillas
-            '."', '?"', '!"',           # Puntuación dentro de comillas
-            '." ', '?" ', '!" '         # Puntuación dentro de comillas con espacio
-        ]
-
-        current_text = '\n\n'.join(paragraphs)
+        text_length = len(text)
+        max_segment_length = segment_size * 1.5
         current_position = 0
 
-        while current_position < len(current_text):
+        while current_position < text_length:
+            # Inicio real del segmento, sin espacios iniciales
+            first_char = _NON_WHITESPACE_RE.search(text, current_position)
+            segment_start = first_char.start() if first_char else text_length
+
             # Buscar el próximo final de segmento válido
             next_end = -1
             valid_end = False
             search_position = current_position
 
-            while not valid_end and search_position < len(current_text):
+            while not valid_end and search_position < text_length:
                 # Encontrar el próximo final de oración
-                next_candidate = float('inf')
-                for ending in sentence_endings:
-                    pos = current_text.find(ending, search_position)
-                    if pos != -1 and pos < next_candidate:
-                        next_candidate = pos
-                        next_end = pos + len(ending)
-
-                if next_candidate == float('inf'):
+                ending = _SENTENCE_END_RE.search(text, search_position)
+                if ending is None:
                     # No se encontraron más finales, tomar el resto del texto
                     break
 
+                next_end = ending.end()
+
                 # Verificar si después del final hay una línea en blanco
-                end_pos = next_end
-                while end_pos < len(current_text) and current_text[end_pos].isspace():
-                    if end_pos + 1 < len(current_text) and current_text[end_pos:end_pos+2] == '\n\n':
-                        valid_end = True
-                        break
-                    end_pos += 1
+                if _BLANK_LINE_RE.match(text, next_end):
+                    valid_end = True
+                    break
 
-                if not valid_end:
-                    search_position = next_end
+                search_position = next_end
 
-                # Verificar el tamaño del segmento potencial
-                potential_segment = current_text[current_position:end_pos].strip()
-                if len(potential_segment) >= self.segment_size * 1.5:
-                    # Si el segmento es demasiado grande, forzar el corte
+                # Si el segmento es demasiado grande, forzar el corte
+                segment_stop = ending.start() + len(ending.group().rstrip())
+                if segment_stop - segment_start >= max_segment_length:
                     valid_end = True
 
             if next_end == -1 or not valid_end:
                 # No se encontraron más finales válidos, añadir el resto como último segmento
-                remaining_text = current_text[current_position:].strip()
+                remaining_text = text[current_position:].strip()
                 if remaining_text:
                     segments.append(remaining_text)
                 break
 
             # Encontrar el final real del segmento (incluyendo la línea en blanco)
-            segment_end = next_end
-            while segment_end < len(current_text):
-                if current_text[segment_end:segment_end+2] == '\n\n':
-                    segment_end += 2
-                    break
-                segment_end += 1
+            blank_line = text.find('\n\n', next_end)
+            segment_end = blank_line + 2 if blank_line != -1 else text_length
 
             # Extraer y añadir el segmento
-            segment_text = current_text[current_position:segment_end].strip()
+            segment_text = text[current_position:segment_end].strip()
             if segment_text:
                 segments.append(segment_text)
 
@@ -142,7 +174,11 @@ class TranslatorLogic:
 
     def translate_text(self, text: str, source_lang: str, target_lang: str,
                       api_key: str, provider: str, model: str,
-                      custom_terms: str = "") -> Optional[str]:
+                      custom_terms: str = "",
+                      segment_size: Optional[int] = None,
+                      translation_memory: Optional[TranslationDatabase] = None,
+                      rate_limiter: Optional[TokenBucket] = None,
+                      cancel_event: Optional[threading.Event] = None) -> Optional[str]:
         """
         Traduce el texto utilizando el proveedor y modelo especificados.
 
@@ -154,6 +190,13 @@ class TranslatorLogic:
             provider (str): Identificador del proveedor
             model (str): Identificador del modelo
             custom_terms (str): Términos personalizados para la traducción
+            segment_size (Optional[int]): Caracteres por segmento; None para
+                enviar el texto completo
+            translation_memory (TranslationDatabase): Memoria de traducción opcional
+                para reutilizar segmentos ya traducidos
+            rate_limiter (TokenBucket): Limitador de solicitudes por minuto
+                compartido entre todas las traducciones en curso
+            cancel_event (threading.Event): Evento que aborta la traducción en curso
 
         Returns:
             Optional[str]: Texto traducido o None si hay error
@@ -168,37 +211,71 @@ class TranslatorLogic:
                 raise ValueError(f"Modelo no soportado: {model}")
 
             # Segmentar el texto
-            segments = self._segment_text(text)
-            translated_segments = []
+            segments = self._segment_text(text, segment_size)
 
-            # Traducir cada segmento
-            for i, segment in enumerate(segments, 1):
-                print(f"Traduciendo segmento {i} de {len(segments)}")
-
-                translated_segment = self._translate_segment(
-                    segment, source_lang, target_lang, api_key,
-                    provider, model_config, custom_terms
+            # Agrupar segmentos idénticos para traducir cada uno una sola vez
+            segment_keys = [
+                TranslationDatabase.make_tm_key(
+                    segment, source_lang, target_lang, model, provider, custom_terms
                 )
-
-                if translated_segment is None:
-                    raise ValueError(f"Error traduciendo segmento {i}")
-
-                translated_segments.append(translated_segment)
-
-                # Esperar entre segmentos para evitar límites de rate
-                if i < len(segments):
-                    time.sleep(2)
-
-            # Unir todos los segmentos traducidos
-            return '\n\n'.join(translated_segments)
-
+                for segment in segments
+            ]
+            unique_segments = dict(zip(segment_keys, segments))
+
+            # Con un solo segmento la búsqueda en memoria la hace quien llama
+            use_memory = translation_memory is not None and len(unique_segments) > 1
+            translations = (
+                translation_memory.tm_get_many(list(unique_segments)) if use_memory else {}
+            )
+            pending = [
+                (key, segment) for key, segment in unique_segments.items()
+                if key not in translations
+            ]
+            new_translations = {}
+
+            try:
+                # Traducir solo los segmentos que no están en memoria
+                for i, (key, segment) in enumerate(pending, 1):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise TranslationCancelled("Traducción cancelada")
+
+                    # Esperar turno según el límite del proveedor
+                    if rate_limiter is not None and not rate_limiter.wait(cancel_event):
+                        raise TranslationCancelled("Traducción cancelada")
+
+                    print(f"Traduciendo segmento {i} de {len(pending)}")
+
+                    translated_segment = self._translate_segment(
+                        segment, source_lang, target_lang, api_key,
+                        provider, model_config, custom_terms, cancel_event,
+                        rate_limiter
+                    )
+
+                    if translated_segment is None:
+                        raise ValueError(f"Error traduciendo segmento {i}")
+
+                    new_translations[key] = translated_segment
+            finally:
+                # Guardar lo traducido aunque falle un segmento posterior
+                if use_memory and new_translations:
+                    translation_memory.tm_put_many(new_translations)
+
+            # Reconstruir el texto en el orden original
+            translations.update(new_translations)
+            return '\n\n'.join(translations[key] for key in segment_keys)
+
+        except TranslationCancelled:
+            # La detención la pidió el usuario: no es un error que deba reportarse
+            return None
         except Exception as e:
             print(f"Error en la traducción: {str(e)}")
             return None
 
     def _translate_segment(self, text: str, source_lang: str, target_lang: str,
                          api_key: str, provider: str, model_config: Dict,
-                         custom_terms: str = "") -> Optional[str]:
+                         custom_terms: str = "",
+                         cancel_event: Optional[threading.Event] = None,
+                         rate_limiter: Optional[TokenBucket] = None) -> Optional[str]:
         """
         Traduce un segmento individual de texto.
         """
@@ -206,29 +283,35 @@ class TranslatorLogic:
             if provider == 'gemini':
                 return self._translate_gemini(
                     text, source_lang, target_lang, api_key, model_config,
-                    custom_terms
+                    custom_terms, cancel_event, rate_limiter
                 )
             elif provider == 'together':
                 return self._translate_together(
                     text, source_lang, target_lang, api_key, model_config,
-                    custom_terms
+                    custom_terms, cancel_event, rate_limiter
                 )
             elif provider == 'deepinfra':
                 return self._translate_deepinfra(
                     text, source_lang, target_lang, api_key, model_config,
-                    custom_terms
+                    custom_terms, cancel_event, rate_limiter
                 )
             else:
                 raise ValueError(f"Proveedor no implementado: {provider}")
+        except TranslationCancelled:
+            raise
         except Exception as e:
             print(f"Error traduciendo segmento: {str(e)}")
             return None
 
     def _translate_gemini(self, text: str, source_lang: str, target_lang: str,
-                         api_key: str, model_config: Dict, custom_terms: str = "") -> Optional[str]:
+                         api_key: str, model_config: Dict, custom_terms: str = "",
+                         cancel_event: Optional[threading.Event] = None,
+                         rate_limiter: Optional[TokenBucket] = None) -> Optional[str]:
         """Traduce usando la API de Google Gemini"""
         try:
-            url = f"{self.models_config['gemini']['base_url']}/{model_config['endpoint']}?key={api_key}"
+            # Usar la variante en streaming del endpoint
+            endpoint = model_config['endpoint'].replace(':generateContent', ':streamGenerateContent')
+            url = f"{self.models_config['gemini']['base_url']}/{endpoint}?alt=sse&key={api_key}"
 
             # Construir el prompt base
             prompt = self.prompt_template.replace(
@@ -269,11 +352,13 @@ class TranslatorLogic:
                 }]
             }
 
-            response = requests.post(url, headers=headers, json=data)
-            response.raise_for_status()
-
-            return self._process_gemini_response(response.json())
+            with self._post_with_retry(url, headers, data, cancel_event,
+                                       rate_limiter) as response:
+                response.raise_for_status()
+                return self._process_gemini_stream(response, cancel_event)
 
+        except TranslationCancelled:
+            raise
         except requests.exceptions.RequestException as e:
             print(f"Error en la solicitud HTTP: {str(e)}")
             if hasattr(e, 'response') and e.response:
@@ -284,7 +369,9 @@ class TranslatorLogic:
             return None
 
     def _translate_together(self, text: str, source_lang: str, target_lang: str,
-                          api_key: str, model_config: Dict, custom_terms: str = "") -> Optional[str]:
+                          api_key: str, model_config: Dict, custom_terms: str = "",
+                          cancel_event: Optional[threading.Event] = None,
+                          rate_limiter: Optional[TokenBucket] = None) -> Optional[str]:
         """Traduce usando la API de Together AI"""
         try:
             url = self.models_config['together']['base_url']
@@ -330,20 +417,24 @@ class TranslatorLogic:
                 "repetition_penalty": 1.2,
                 "stop": ["</s>", "[/INST]"],
                 "max_tokens": model_config.get('max_tokens', 4096),
-                "stream": False
+                "stream": True
             }
 
-            response = requests.post(url, headers=headers, json=data)
-            response.raise_for_status()
-
-            return self._process_together_response(response.json())
+            with self._post_with_retry(url, headers, data, cancel_event,
+                                       rate_limiter) as response:
+                response.raise_for_status()
+                return self._process_together_stream(response, cancel_event)
 
+        except TranslationCancelled:
+            raise
         except Exception as e:
             print(f"Error en Together AI: {str(e)}")
             return None
 
     def _translate_deepinfra(self, text: str, source_lang: str, target_lang: str,
-                           api_key: str, model_config: Dict, custom_terms: str = "") -> Optional[str]:
+                           api_key: str, model_config: Dict, custom_terms: str = "",
+                          cancel_event: Optional[threading.Event] = None,
+                          rate_limiter: Optional[TokenBucket] = None) -> Optional[str]:
         """Traduce usando la API de DeepInfra (formato OpenAI compatible)"""
         try:
             url = self.models_config['deepinfra']['base_url']
@@ -386,75 +477,215 @@ class TranslatorLogic:
                 "temperature": 0.6,
                 "top_p": 0.95,
                 "max_tokens": 100000,
-                "stream": False  # Podemos dejarlo como False para traducciones
+                "stream": True
             }
 
-            response = requests.post(url, headers=headers, json=data)
-            response.raise_for_status()
-
-            return self._process_deepinfra_response(response.json())
+            with self._post_with_retry(url, headers, data, cancel_event,
+                                       rate_limiter) as response:
+                response.raise_for_status()
+                return self._process_deepinfra_stream(response, cancel_event)
 
+        except TranslationCancelled:
+            raise
         except Exception as e:
             print(f"Error en DeepInfra: {str(e)}")
             if hasattr(e, 'response') and e.response:
                 print("Respuesta detallada:", e.response.text)
             return None
 
-    def _process_gemini_response(self, response: Dict) -> Optional[str]:
+    def _post_with_retry(self, url: str, headers: Dict, data: Dict,
+                         cancel_event: Optional[threading.Event] = None,
+                         rate_limiter: Optional[TokenBucket] = None) -> requests.Response:
+        """
+        Envía una solicitud en streaming reintentando ante errores transitorios.
+
+        Las respuestas 429 respetan la cabecera Retry-After; los errores 5xx y de
+        conexión esperan con retroceso exponencial y jitter. Cada reintento consume
+        además un turno de rate_limiter, igual que la primera solicitud. Tras el último
+        intento se devuelve la respuesta (o se propaga el error) para que la trate
+        quien llama.
+        """
+        for attempt in range(MAX_RETRIES):
+            last_attempt = attempt == MAX_RETRIES - 1
+            try:
+                response = self._session.post(url, headers=headers, json=data,
+                                              stream=True, timeout=REQUEST_TIMEOUT)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if last_attempt:
+                    raise
+                delay = self._backoff_delay(attempt)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    return response
+
+                delay = None
+                if response.status_code == 429:
+                    delay = self._parse_retry_after(response)
+                    if delay is not None and delay > MAX_RETRY_AFTER:
+                        # Cuota agotada por mucho tiempo: no tiene sentido esperar
+                        return response
+                if delay is None:
+                    delay = self._backoff_delay(attempt)
+                response.close()
+
+            print(f"Error transitorio del proveedor, reintentando en {delay:.1f} s "
+                  f"(intento {attempt + 2} de {MAX_RETRIES})")
+            if cancel_event is None:
+                time.sleep(delay)
+            elif cancel_event.wait(delay):
+                raise TranslationCancelled("Traducción cancelada")
+
+            # El reintento también cuenta para el límite de solicitudes por minuto
+            if rate_limiter is not None and not rate_limiter.wait(cancel_event):
+                raise TranslationCancelled("Traducción cancelada")
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Calcula la espera exponencial con jitter para un intento"""
+        return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt + random.random())
+
+    def _parse_retry_after(self, response: requests.Response) -> Optional[float]:
+        """
+        Obtiene los segundos de espera indicados por la cabecera Retry-After.
+
+        Returns:
+            Optional[float]: Segundos a esperar o None si la cabecera no es válida
+        """
+        retry_after = response.headers.get('Retry-After')
+        if not retry_after:
+            return None
+
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+        try:
+            retry_date = parsedate_to_datetime(retry_after)
+            return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def _iter_stream_events(self, response: requests.Response,
+                            cancel_event: Optional[threading.Event] = None) -> Iterator[Dict]:
         """
-        Procesa la respuesta de la API de Gemini y extrae el texto traducido.
+        Recorre los eventos de una respuesta en streaming (Server-Sent Events).
+        Si se activa cancel_event se interrumpe la lectura entre fragmentos.
+        El marcador [DONE] se entrega como None y termina la lectura; un evento
+        con la clave 'error' lanza ValueError.
+        """
+        for line in response.iter_lines():
+            if cancel_event is not None and cancel_event.is_set():
+                raise TranslationCancelled("Traducción cancelada")
+
+            # Decodificar por línea para no partir caracteres multibyte
+            line = line.decode('utf-8')
+            if not line.startswith('data:'):
+                continue
+
+            data = line[len('data:'):].strip()
+            if data == '[DONE]':
+                yield None
+                break
+
+            event = json.loads(data)
+            if isinstance(event, dict) and 'error' in event:
+                raise ValueError(f"El proveedor devolvió un error: {event['error']}")
+            yield event
+
+    def _process_gemini_stream(self, response: requests.Response,
+                               cancel_event: Optional[threading.Event] = None) -> Optional[str]:
+        """
+        Procesa la respuesta en streaming de la API de Gemini y une el texto traducido.
         """
         try:
-            if 'candidates' not in response or not response['candidates']:
-                return None
+            chunks = []
+            finish_reason = None
+            for event in self._iter_stream_events(response, cancel_event):
+                if event is None:
+                    break
+
+                candidates = event.get('candidates')
+                if not candidates:
+                    continue
 
-            candidate = response['candidates'][0]
-            if 'content' not in candidate or 'parts' not in candidate['content']:
+                parts = candidates[0].get('content', {}).get('parts', [])
+                chunks.extend(part['text'] for part in parts if 'text' in part)
+                finish_reason = candidates[0].get('finishReason', finish_reason)
+
+            # Sin STOP la respuesta quedó cortada o fue bloqueada
+            if finish_reason != 'STOP':
+                print(f"Respuesta de Gemini incompleta (finishReason: {finish_reason})")
                 return None
 
-            parts = candidate['content']['parts']
-            if not parts or 'text' not in parts[0]:
+            if not chunks:
                 return None
 
-            translated_text = parts[0]['text']
-            return self._clean_translation(translated_text)
+            return self._clean_translation("".join(chunks))
 
+        except TranslationCancelled:
+            raise
         except Exception as e:
             print(f"Error procesando respuesta de Gemini: {str(e)}")
             return None
 
-    def _process_together_response(self, response: Dict) -> Optional[str]:
+    def _process_chat_stream(self, response: requests.Response,
+                             cancel_event: Optional[threading.Event] = None) -> Optional[str]:
         """
-        Procesa la respuesta de la API de Together y extrae el texto traducido.
+        Procesa una respuesta en streaming con formato OpenAI (Together, DeepInfra)
+        y une el texto traducido.
         """
-        try:
-            if 'choices' not in response or not response['choices']:
-                return None
+        chunks = []
+        finished = False
+        finish_reason = None
+        for event in self._iter_stream_events(response, cancel_event):
+            if event is None:
+                finished = True
+                break
 
-            message = response['choices'][0]['message']
-            if 'content' not in message:
-                return None
+            choices = event.get('choices')
+            if not choices:
+                continue
+
+            content = choices[0].get('delta', {}).get('content')
+            if content:
+                chunks.append(content)
+
+            if choices[0].get('finish_reason'):
+                finish_reason = choices[0]['finish_reason']
+                finished = True
+
+        # Sin [DONE] ni finish_reason la conexión se cortó a mitad de respuesta
+        if not finished or finish_reason == 'length':
+            print(f"Respuesta incompleta del proveedor (finish_reason: {finish_reason})")
+            return None
+
+        if not chunks:
+            return None
 
-            return self._clean_translation(message['content'])
+        return self._clean_translation("".join(chunks))
 
+    def _process_together_stream(self, response: requests.Response,
+                                 cancel_event: Optional[threading.Event] = None) -> Optional[str]:
+        """
+        Procesa la respuesta en streaming de la API de Together y une el texto traducido.
+        """
+        try:
+            return self._process_chat_stream(response, cancel_event)
+        except TranslationCancelled:
+            raise
         except Exception as e:
             print(f"Error procesando respuesta de Together: {str(e)}")
             return None
 
-    def _process_deepinfra_response(self, response: Dict) -> Optional[str]:
+    def _process_deepinfra_stream(self, response: requests.Response,
+                                  cancel_event: Optional[threading.Event] = None) -> Optional[str]:
         """
-        Procesa la respuesta de la API de DeepInfra y extrae el texto traducido.
+        Procesa la respuesta en streaming de la API de DeepInfra y une el texto traducido.
         """
         try:
-            if 'choices' not in response or not response['choices']:
-                return None
-
-            message = response['choices'][0]['message']
-            if 'content' not in message:
-                return None
-
-            return self._clean_translation(message['content'])
-
+            return self._process_chat_stream(response, cancel_event)
+        except TranslationCancelled:
+            raise
         except Exception as e:
             print(f"Error procesando respuesta de DeepInfra: {str(e)}")
             return None